@@ -1,15 +1,63 @@
+import argparse
+import shutil
 from PIL import Image
 import sys
 import os
 
+ICO_SIZES = [(256, 256), (128, 128), (64, 64), (48, 48), (32, 32), (16, 16)]
+
+def scale_frames(img, sizes):
+    # Downsample by the largest power-of-two factor that stays at or above the
+    # target with the cheap box reduce(), then LANCZOS only for the remainder
+    frames = []
+    for size in sizes:
+        factor = 1
+        while max(img.width, img.height) // (factor * 2) >= max(size):
+            factor *= 2
+        frame = img.reduce(factor) if factor > 1 else img.copy()
+        # Fit inside the icon keeping the aspect ratio, like Pillow's own ICO path
+        frame.thumbnail(size, Image.LANCZOS)
+        if frame.size != size:
+            # Center non-square sources on a transparent square
+            canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+            canvas.paste(frame.convert('RGBA'),
+                         ((size[0] - frame.width) // 2, (size[1] - frame.height) // 2))
+            frame = canvas
+        frames.append(frame)
+    return frames
+
 def convert_to_ico(source, target):
     try:
         img = Image.open(source)
-        img.save(target, format='ICO', sizes=[(256, 256), (128, 128), (64, 64), (48, 48), (32, 32), (16, 16)])
+        img.load()
+        # reduce() rejects palette, 1-bit and 16-bit modes, and thumbnail() falls
+        # back to NEAREST for them, so convert once up front
+        if img.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+            img = img.convert('RGBA')
+        frames = scale_frames(img, ICO_SIZES)
+        # Hand Pillow every size pre-scaled so it does not resample the source per size
+        frames[0].save(target, format='ICO', sizes=ICO_SIZES, append_images=frames[1:])
         print(f"Successfully converted {source} to {target}")
     except Exception as e:
         print(f"Error converting image: {e}")
         sys.exit(1)
 
+def copy_source_png(source, dest_png):
+    print(f"Copying from {source} to {dest_png}")
+    try:
+        shutil.copy2(source, dest_png)
+        print("Copy successful.")
+    except Exception as e:
+        print(f"Copy failed: {e}")
+        sys.exit(1)
+
 if __name__ == "__main__":
-    convert_to_ico("C:/Temp/mp3image/C_Sharp/icon.png", "C:/Temp/mp3image/C_Sharp/icon.ico")
+    parser = argparse.ArgumentParser(description="Build the application .ico from icon.png")
+    parser.add_argument("--source-png", help="PNG to copy over icon.png before converting")
+    parser.add_argument("--png", default="C:/Temp/mp3image/C_Sharp/icon.png")
+    parser.add_argument("--ico", default="C:/Temp/mp3image/C_Sharp/icon.ico")
+    args = parser.parse_args()
+
+    if args.source_png:
+        copy_source_png(args.source_png, args.png)
+    convert_to_ico(args.png, args.ico)
@@ -1,14 +1,241 @@
+import contextlib
+import io
 import logging
+import mmap
 import os
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 
 from mutagen.mp3 import MP3  # type: ignore
 from mutagen.id3 import ID3, APIC, ID3NoHeaderError, TIT2, TPE1  # type: ignore
 
+# tinytag is optional: it is much lighter than mutagen for plain tag reads.
+# Writing always goes through mutagen.
+try:
+    from tinytag import TinyTag  # type: ignore
+except ImportError:
+    TinyTag = None
+
+# Pillow is optional: without it cover images are embedded as-is.
+try:
+    from PIL import Image, ImageOps  # type: ignore
+except ImportError:
+    Image = None
+    ImageOps = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Explicit buffer size for MP3 file handles. Python's default heuristic can
+# fall back to tiny reads on network shares, which makes mutagen very slow.
+MP3_BUFFER_SIZE = 65536
+
+# Largest width/height of embedded cover art. Bigger images are downscaled on
+# embed so the APIC frame (and every later rewrite/decode of it) stays small.
+COVER_MAX_DIM = 1000
+COVER_JPEG_QUALITY = 88
+
+# Free space to leave after the ID3 tag when it has to grow. With headroom, later
+# text-only edits fit inside the existing tag block and mutagen rewrites just the
+# tag in place instead of shifting the whole audio payload.
+MIN_TAG_PADDING = 1024
+
+def _open_mp3(mp3_path: str, writable: bool = False) -> BinaryIO:
+    """Opens an MP3 file with a large read buffer for handing to mutagen.
+
+    Args:
+        mp3_path: The absolute path to the MP3 file.
+        writable: Open for in-place update ('rb+') so the tags can be saved
+            through the same handle.
+
+    Returns:
+        A buffered binary file object.
+
+    Raises:
+        FileNotFoundError: If the MP3 file does not exist.
+    """
+    mode = 'rb+' if writable else 'rb'
+    # No separate exists() check: let open() fail rather than paying for an extra stat
+    try:
+        return open(mp3_path, mode, buffering=MP3_BUFFER_SIZE)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"MP3 file not found: {mp3_path}") from e
+
+def _save_through(f: BinaryIO, audio: MP3) -> None:
+    """Saves the tags through the handle the file was parsed from.
+
+    Parsing leaves the handle at EOF, but mutagen looks for the existing tag at
+    the current position, so rewind first or it prepends a duplicate tag.
+    """
+    f.seek(0)
+    audio.save(f, v2_version=3, padding=_tag_padding)
+
+@contextlib.contextmanager
+def _map_mp3(mp3_path: str) -> Iterator[BinaryIO]:
+    """Yields a read-only memory map of an MP3 file for mutagen to parse.
+
+    mutagen seeks around the ID3v2 header and ID3v1 trailer with many small
+    reads; through a map these are served from the page cache without a
+    read() syscall each. Falls back to the buffered file when the file cannot
+    be mapped (empty files, some network mounts).
+
+    Raises:
+        FileNotFoundError: If the MP3 file does not exist.
+    """
+    with _open_mp3(mp3_path) as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            mapped = None
+
+        if mapped is None:
+            yield f
+        else:
+            with mapped:
+                yield mapped
+
+def _tag_padding(info) -> int:
+    """mutagen padding callback: reuse existing slack whenever the tag still fits.
+
+    Only a tag that outgrows its block (negative padding) gets MIN_TAG_PADDING
+    of headroom; topping up slack that still fits would resize the tag and
+    force the audio to be rewritten.
+    """
+    return info.padding if info.padding >= 0 else MIN_TAG_PADDING
+
+def _find_cover(tags: Optional[ID3]) -> Optional[bytes]:
+    """Returns the data of the first APIC frame in the tags, if any."""
+    if not tags:
+        return None
+    # Frames are keyed like "APIC:Cover", so look the key up instead of
+    # materializing and type-checking every frame
+    apic_keys = [key for key in tags.keys() if key.startswith("APIC")]
+    if not apic_keys:
+        return None
+    return tags[apic_keys[0]].data
+
+def _read_metadata(tags: Optional[ID3]) -> dict[str, Optional[str]]:
+    """Returns the Title and Artist text from the tags, or None for each missing frame."""
+    title = None
+    if tags and 'TIT2' in tags:
+        title = tags['TIT2'].text[0]
+
+    artist = None
+    if tags and 'TPE1' in tags:
+        artist = tags['TPE1'].text[0]
+
+    return {'title': title, 'artist': artist}
+
+def _replace_cover(tags: ID3, image_data: bytes, mime: str) -> None:
+    """Replaces any existing APIC frames in the tags with a single front cover."""
+    # Create APIC frame
+    # 3 is "Front Cover"
+    apic = APIC(
+        encoding=3, # 3 is UTF-8
+        mime=mime,
+        type=3,
+        desc='Cover',
+        data=image_data
+    )
+
+    # Remove existing APIC frames (optional, but good practice to allow replacement)
+    tags.delall("APIC")
+    tags.add(apic)
+
+def _tinytag_cover(tag) -> Optional[bytes]:
+    """Returns the cover image data from a TinyTag result, if any."""
+    # tinytag 2.x exposes images.any; 1.x only has get_image()
+    images = getattr(tag, 'images', None)
+    if images is None:
+        return tag.get_image() or None
+    image = images.any
+    return image.data if image else None
+
+def downscale_cover(image_data: bytes, mime: str, max_dim: int = COVER_MAX_DIM) -> tuple[bytes, str]:
+    """Shrinks cover art so neither side exceeds max_dim, re-encoding it as JPEG.
+
+    Images already within max_dim are returned unchanged, as is everything
+    when Pillow is not installed or the image cannot be decoded.
+
+    Args:
+        image_data: The binary image data.
+        mime: The MIME type of image_data.
+        max_dim: The largest allowed width or height in pixels.
+
+    Returns:
+        A tuple of the (possibly re-encoded) binary image data and its MIME type.
+    """
+    if Image is None:
+        return image_data, mime
+
+    try:
+        im = Image.open(io.BytesIO(image_data))
+        if im.width <= max_dim and im.height <= max_dim:
+            return image_data, mime
+
+        # Re-encoding drops EXIF, so apply its orientation to the pixels first
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((max_dim, max_dim), Image.LANCZOS)
+        if im.mode in ('RGBA', 'LA', 'PA') or 'transparency' in im.info:
+            # JPEG has no alpha: flatten onto white so transparent areas do not turn black
+            im = im.convert('RGBA')
+            background = Image.new('RGB', im.size, 'white')
+            background.paste(im, mask=im.getchannel('A'))
+            im = background
+        elif im.mode not in ('RGB', 'L'):
+            im = im.convert('RGB')
+        out = io.BytesIO()
+        im.save(out, format='JPEG', quality=COVER_JPEG_QUALITY)
+    except Exception as e:
+        logger.warning(f"Could not downscale cover art, embedding it as-is: {e}")
+        return image_data, mime
+
+    logger.info(f"Downscaled cover art to {im.width}x{im.height}")
+    return out.getvalue(), 'image/jpeg'
+
+def read_image_file(image_path: str, max_dim: Optional[int] = None) -> tuple[bytes, str]:
+    """Reads an image file and determines its MIME type from the extension.
+
+    Args:
+        image_path: The absolute path to the image file.
+        max_dim: If given, downscale the image so neither side exceeds it
+            (see downscale_cover).
+
+    Returns:
+        A tuple of the binary image data and its MIME type.
+
+    Raises:
+        FileNotFoundError: If the image file does not exist.
+    """
+    try:
+        img = open(image_path, 'rb', buffering=0)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"Image file not found: {image_path}") from e
+
+    with img:
+        try:
+            # Map the file so the single copy mutagen needs comes straight
+            # from the page cache rather than through an intermediate buffer
+            with mmap.mmap(img.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                image_data = mapped[:]
+        except (ValueError, OSError):
+            # Empty files, and some network mounts, cannot be mapped
+            image_data = img.read()
+
+    # Determine MIME type based on extension
+    ext = os.path.splitext(image_path)[1].lower()
+    if ext in ['.jpg', '.jpeg']:
+        mime = 'image/jpeg'
+    elif ext == '.png':
+        mime = 'image/png'
+    else:
+        logger.warning(f"Unknown image extension {ext}, defaulting to image/jpeg")
+        mime = 'image/jpeg'
+
+    if max_dim is not None:
+        return downscale_cover(image_data, mime, max_dim)
+    return image_data, mime
+
 def extract_cover_art(mp3_path: str) -> Optional[bytes]:
     """Extracts the cover art image data from an MP3 file's ID3 tags.
 
@@ -21,12 +248,17 @@ def extract_cover_art(mp3_path: str) -> Optional[bytes]:
     Raises:
         FileNotFoundError: If the MP3 file does not exist.
     """
-    if not os.path.exists(mp3_path):
-        logger.error(f"File not found: {mp3_path}")
-        raise FileNotFoundError(f"File not found: {mp3_path}")
-
     try:
-        audio = MP3(mp3_path, ID3=ID3)
+        if TinyTag is not None:
+            with _open_mp3(mp3_path) as f:
+                cover = _tinytag_cover(TinyTag.get(file_obj=f, image=True))
+        else:
+            with _map_mp3(mp3_path) as f:
+                audio = MP3(f, ID3=ID3)
+            cover = _find_cover(audio.tags)
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        raise
     except ID3NoHeaderError:
         logger.warning(f"No ID3 header found for {mp3_path}")
         return None
@@ -34,71 +266,41 @@ def extract_cover_art(mp3_path: str) -> Optional[bytes]:
         logger.error(f"Error reading MP3 file {mp3_path}: {e}")
         return None
 
-    # Check for existing ID3 tags
-    if audio.tags:
-        for tag in audio.tags.values():
-            if isinstance(tag, APIC):
-                logger.info(f"Found existing cover art in {mp3_path}")
-                return tag.data
-    
+    if cover is not None:
+        logger.info(f"Found existing cover art in {mp3_path}")
+        return cover
+
     logger.info(f"No cover art found in {mp3_path}")
     return None
 
 
-def embed_cover_art(mp3_path: str, image_path: str) -> None:
+def embed_cover_art(mp3_path: str, image_path: str, max_dim: int = COVER_MAX_DIM) -> None:
     """Embeds an image as the cover art (APIC frame) into an MP3 file.
 
     Args:
         mp3_path: The absolute path to the MP3 file.
         image_path: The absolute path to the image file.
+        max_dim: Images larger than this (in either dimension) are downscaled
+            and stored as JPEG.
 
     Raises:
         FileNotFoundError: If either the MP3 or image file does not exist.
         ValueError: If the image format is not supported (only jpeg/png are typical).
     """
-    if not os.path.exists(mp3_path):
-        raise FileNotFoundError(f"MP3 file not found: {mp3_path}")
-    if not os.path.exists(image_path):
-        raise FileNotFoundError(f"Image file not found: {image_path}")
-
     try:
-        audio = MP3(mp3_path, ID3=ID3)
-        
-        # Add ID3 tag if it doesn't exist
-        try:
-            audio.add_tags()
-        except Exception:
-            pass # Tags probably already exist
+        with _open_mp3(mp3_path, writable=True) as f:
+            audio = MP3(f, ID3=ID3)
 
-        with open(image_path, 'rb') as img:
-            image_data = img.read()
+            # Add ID3 tag if it doesn't exist
+            try:
+                audio.add_tags()
+            except Exception:
+                pass # Tags probably already exist
 
-        # Determine MIME type based on extension
-        ext = os.path.splitext(image_path)[1].lower()
-        if ext in ['.jpg', '.jpeg']:
-            mime = 'image/jpeg'
-        elif ext == '.png':
-            mime = 'image/png'
-        else:
-            logger.warning(f"Unknown image extension {ext}, defaulting to image/jpeg")
-            mime = 'image/jpeg'
-
-        # Create APIC frame
-        # 3 is "Front Cover"
-        apic = APIC(
-            encoding=3, # 3 is UTF-8
-            mime=mime,
-            type=3, 
-            desc='Cover',
-            data=image_data
-        )
-
-        # Remove existing APIC frames (optional, but good practice to allow replacement)
-        audio.tags.delall("APIC")
-        
-        audio.tags.add(apic)
-        audio.save(v2_version=3)
-        logger.info(f"Successfully embedded {image_path} into {mp3_path} (ID3v2.3)")
+            image_data, mime = read_image_file(image_path, max_dim)
+            _replace_cover(audio.tags, image_data, mime)
+            _save_through(f, audio)
+            logger.info(f"Successfully embedded {image_path} into {mp3_path} (ID3v2.3)")
 
     except Exception as e:
         logger.error(f"Failed to embed cover art: {e}")
@@ -113,26 +315,23 @@ def get_metadata(mp3_path: str) -> dict[str, Optional[str]]:
     Returns:
         A dictionary with keys 'title' and 'artist', containing the tag values or None.
     """
-    if not os.path.exists(mp3_path):
-        raise FileNotFoundError(f"File not found: {mp3_path}")
-
     try:
-        audio = MP3(mp3_path, ID3=ID3)
+        if TinyTag is not None:
+            with _open_mp3(mp3_path) as f:
+                tag = TinyTag.get(file_obj=f)
+            return {'title': tag.title or None, 'artist': tag.artist or None}
+
+        with _map_mp3(mp3_path) as f:
+            audio = MP3(f, ID3=ID3)
+    except FileNotFoundError:
+        raise
     except ID3NoHeaderError:
         return {'title': None, 'artist': None}
     except Exception as e:
         logger.error(f"Error reading metadata from {mp3_path}: {e}")
         return {'title': None, 'artist': None}
 
-    title = None
-    if audio.tags and 'TIT2' in audio.tags:
-        title = audio.tags['TIT2'].text[0]
-
-    artist = None
-    if audio.tags and 'TPE1' in audio.tags:
-        artist = audio.tags['TPE1'].text[0]
-        
-    return {'title': title, 'artist': artist}
+    return _read_metadata(audio.tags)
 
 def set_metadata(mp3_path: str, title: str, artist: str) -> None:
     """Sets the Title (TIT2) and Artist (TPE1) tags for an MP3 file.
@@ -142,24 +341,121 @@ def set_metadata(mp3_path: str, title: str, artist: str) -> None:
         title: The title text.
         artist: The artist text.
     """
-    if not os.path.exists(mp3_path):
-        raise FileNotFoundError(f"File not found: {mp3_path}")
-
     try:
-        audio = MP3(mp3_path, ID3=ID3)
-        
-        try:
-            audio.add_tags()
-        except Exception:
-            pass 
+        with _open_mp3(mp3_path, writable=True) as f:
+            audio = MP3(f, ID3=ID3)
 
-        # encoding=3 is UTF-8
-        audio.tags.add(TIT2(encoding=3, text=title))
-        audio.tags.add(TPE1(encoding=3, text=artist))
-        
-        audio.save(v2_version=3)
+            try:
+                audio.add_tags()
+            except Exception:
+                pass
+
+            # encoding=3 is UTF-8
+            audio.tags.add(TIT2(encoding=3, text=title))
+            audio.tags.add(TPE1(encoding=3, text=artist))
+
+            _save_through(f, audio)
         logger.info(f"Updated metadata for {mp3_path}: Title='{title}', Artist='{artist}'")
         
     except Exception as e:
         logger.error(f"Failed to update metadata: {e}")
         raise
+
+def apply_changes(mp3_path: str, title: str, artist: str, image_path: Optional[str] = None,
+                  max_dim: int = COVER_MAX_DIM) -> None:
+    """Sets the Title/Artist tags and optionally replaces the cover art in one save.
+
+    Args:
+        mp3_path: The absolute path to the MP3 file.
+        title: The title text.
+        artist: The artist text.
+        image_path: The absolute path to a new cover image, or None to keep the existing one.
+        max_dim: Images larger than this (in either dimension) are downscaled
+            and stored as JPEG.
+
+    Raises:
+        FileNotFoundError: If either the MP3 or image file does not exist.
+    """
+    try:
+        with _open_mp3(mp3_path, writable=True) as f:
+            audio = MP3(f, ID3=ID3)
+            if audio.tags is None:
+                audio.add_tags()
+
+            # encoding=3 is UTF-8
+            audio.tags.add(TIT2(encoding=3, text=title))
+            audio.tags.add(TPE1(encoding=3, text=artist))
+
+            if image_path:
+                image_data, mime = read_image_file(image_path, max_dim)
+                _replace_cover(audio.tags, image_data, mime)
+
+            _save_through(f, audio)
+        logger.info(f"Applied changes to {mp3_path}: Title='{title}', Artist='{artist}', Image={image_path}")
+
+    except Exception as e:
+        logger.error(f"Failed to apply changes: {e}")
+        raise
+
+
+class Mp3Session:
+    """A single parsed MP3 file kept in memory across a read/edit/save cycle.
+
+    The MP3 header and ID3 tag block are parsed once on construction. Edits
+    only touch the in-memory tags; commit() writes them back with one save.
+    """
+
+    def __init__(self, mp3_path: str):
+        """Parses the MP3 file.
+
+        Args:
+            mp3_path: The absolute path to the MP3 file.
+
+        Raises:
+            FileNotFoundError: If the MP3 file does not exist.
+        """
+        self.path = mp3_path
+        with _map_mp3(mp3_path) as f:
+            self.audio = MP3(f, ID3=ID3)
+        self.dirty = False
+
+    def get_metadata(self) -> dict[str, Optional[str]]:
+        """Returns a dictionary with keys 'title' and 'artist', or None for missing tags."""
+        return _read_metadata(self.audio.tags)
+
+    def get_cover(self) -> Optional[bytes]:
+        """Returns the embedded cover art image data, or None if there is none."""
+        return _find_cover(self.audio.tags)
+
+    def set_metadata(self, title: str, artist: str) -> None:
+        """Sets the Title (TIT2) and Artist (TPE1) tags in memory."""
+        self._ensure_tags()
+        # encoding=3 is UTF-8
+        self.audio.tags.add(TIT2(encoding=3, text=title))
+        self.audio.tags.add(TPE1(encoding=3, text=artist))
+        self.dirty = True
+
+    def set_cover(self, image_data: bytes, mime: str) -> None:
+        """Replaces the cover art (APIC frame) in memory."""
+        self._ensure_tags()
+        _replace_cover(self.audio.tags, image_data, mime)
+        self.dirty = True
+
+    def commit(self) -> None:
+        """Writes pending tag changes back to the file with a single save."""
+        if not self.dirty:
+            return
+
+        try:
+            with _open_mp3(self.path, writable=True) as f:
+                self.audio.save(f, v2_version=3, padding=_tag_padding)
+        except Exception as e:
+            logger.error(f"Failed to save tags to {self.path}: {e}")
+            raise
+
+        self.dirty = False
+        logger.info(f"Saved tags for {self.path} (ID3v2.3)")
+
+    def _ensure_tags(self) -> None:
+        if self.audio.tags is None:
+            self.audio.add_tags()
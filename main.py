@@ -1,13 +1,19 @@
 import sys
 import os
 import logging
+import functools
+import hashlib
+import re
+from pathlib import Path
 from typing import Optional
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QMessageBox, QFileDialog,
                              QLineEdit, QFormLayout, QSizePolicy)
-from PyQt6.QtCore import Qt, pyqtSignal, QMimeData
-from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QPixmap, QMouseEvent
+from PyQt6.QtCore import (Qt, pyqtSignal, QMimeData, QObject, QRunnable, QThreadPool,
+                          QBuffer, QByteArray, QIODevice, QSize, QTimer)
+from PyQt6.QtGui import (QDragEnterEvent, QDropEvent, QPixmap, QMouseEvent, QImageReader,
+                         QPixmapCache)
 
 import audio_handler
 
@@ -15,6 +21,53 @@ import audio_handler
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Default artist requested by user, used when the MP3 has no TPE1 tag
+_DEFAULT_ARTIST = "סרקאסטים: אורן וצחי"
+
+def read_scaled_pixmap(reader: QImageReader, target_size: QSize) -> QPixmap:
+    """Decodes an image no larger than target_size, keeping its aspect ratio.
+
+    Cover art is often several thousand pixels wide while the panel is a few
+    hundred, so let the decoder downscale (JPEG can do this natively) instead
+    of decoding at full size and smooth-scaling afterwards.
+    """
+    source_size = reader.size()
+    if (source_size.isValid() and not target_size.isEmpty()
+            and (source_size.width() > target_size.width()
+                 or source_size.height() > target_size.height())):
+        reader.setScaledSize(source_size.scaled(target_size, Qt.AspectRatioMode.KeepAspectRatio))
+    return QPixmap.fromImage(reader.read())
+
+def pixmap_from_data(data: bytes, target_size: QSize) -> QPixmap:
+    """Decodes in-memory image data no larger than target_size.
+
+    Results are kept in QPixmapCache keyed by a hash of the data and the target
+    size, so the same cover is only decoded once however it was reached.
+    """
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    key = f"{digest}:{target_size.width()}x{target_size.height()}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None:
+        return pixmap
+
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    pixmap = read_scaled_pixmap(QImageReader(buffer), target_size)
+    buffer.close()
+    if not pixmap.isNull():
+        QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+@functools.lru_cache(maxsize=32)
+def _load_image_pixmap(path: str, mtime: float, width: int, height: int) -> QPixmap:
+    """Loads an image file pre-scaled to width x height.
+
+    mtime is only part of the cache key, so rewriting the file invalidates the
+    entry. Returns a null pixmap if the image cannot be decoded.
+    """
+    return read_scaled_pixmap(QImageReader(path), QSize(width, height))
+
 class DropLabel(QLabel):
     """A QLabel that accepts file drops and clicks."""
     
@@ -26,6 +79,12 @@ class DropLabel(QLabel):
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setAcceptDrops(True)
         self.allowed_extensions = [ext.lower() for ext in allowed_extensions]
+        # Matches a path ending in any allowed extension, case-insensitively
+        self._ext_re = re.compile(
+            r'(?i)\.(' + '|'.join(re.escape(ext.lstrip('.')) for ext in self.allowed_extensions) + r')$')
+        # Create filter string like "Supported Files (*.mp3 *.jpg)"
+        exts_str = " ".join(f"*{ext}" for ext in self.allowed_extensions)
+        self._file_filter = f"Supported Files ({exts_str});;All Files (*)"
         
         # Style
         self.setStyleSheet("""
@@ -47,24 +106,37 @@ class DropLabel(QLabel):
         # Set cursor to point to indicate it's clickable
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.original_pixmap: Optional[QPixmap] = None
+        # (pixmap cacheKey, width, height) of the pixmap currently shown
+        self._last_scaled_key: Optional[tuple[int, int, int]] = None
+        # Only rescale once a window drag settles, not on every intermediate size
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self.update_scaled_pixmap)
 
     def clear(self) -> None:
         """Clears the label content and resets the original pixmap."""
         self.original_pixmap = None
+        self._last_scaled_key = None
         super().clear()
 
     def setPixmap(self, pixmap: QPixmap) -> None:
         self.original_pixmap = pixmap
+        # The label may have shown text since, so always redraw a newly set pixmap
+        self._last_scaled_key = None
         self.update_scaled_pixmap()
 
     def resizeEvent(self, event) -> None:
         if self.original_pixmap:
-            self.update_scaled_pixmap()
+            self._resize_timer.start()
         super().resizeEvent(event)
 
     def update_scaled_pixmap(self) -> None:
         if not self.original_pixmap or self.original_pixmap.isNull():
             return
+        key = (self.original_pixmap.cacheKey(), self.width(), self.height())
+        if key == self._last_scaled_key:
+            return
         # Scale to fill efficiently while keeping aspect ratio
         scaled = self.original_pixmap.scaled(
             self.size(), 
@@ -72,6 +144,7 @@ class DropLabel(QLabel):
             Qt.TransformationMode.SmoothTransformation
         )
         super().setPixmap(scaled)
+        self._last_scaled_key = key
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
@@ -79,11 +152,7 @@ class DropLabel(QLabel):
         super().mousePressEvent(event)
 
     def open_file_dialog(self) -> None:
-        # Create filter string like "Supported Files (*.mp3 *.jpg)"
-        exts_str = " ".join([f"*{ext}" for ext in self.allowed_extensions])
-        file_filter = f"Supported Files ({exts_str});;All Files (*)"
-        
-        file_path, _ = QFileDialog.getOpenFileName(self, "Open File", "", file_filter)
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open File", "", self._file_filter)
         if file_path:
             self.fileDropped.emit(file_path)
 
@@ -94,29 +163,85 @@ class DropLabel(QLabel):
             event.ignore()
 
     def dropEvent(self, event: QDropEvent) -> None:
-        files = [u.toLocalFile() for u in event.mimeData().urls()]
-        if not files:
-            return
-
-        # Take the first valid file
-        for file_path in files:
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext in self.allowed_extensions:
+        # Take the first valid file; stop converting URLs as soon as one matches
+        for url in event.mimeData().urls():
+            file_path = url.toLocalFile()
+            if self._ext_re.search(file_path):
                 self.fileDropped.emit(file_path)
                 return
         
         # If we got here, no valid file was found
         # (Optional: emit error or shake animation)
 
+class TaskSignals(QObject):
+    """Signals for reporting background task results back to the GUI thread."""
+
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class LoadMp3Task(QRunnable):
+    """Parses an MP3 file off the GUI thread and emits the resulting session."""
+
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = TaskSignals()
+
+    def run(self) -> None:
+        try:
+            session = audio_handler.Mp3Session(self.file_path)
+        except Exception as e:
+            logger.error(f"Failed to open MP3: {e}")
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(session)
+
+class SaveMp3Task(QRunnable):
+    """Applies tag edits to a session and writes them back off the GUI thread."""
+
+    def __init__(self, session: audio_handler.Mp3Session, title: str, artist: str,
+                 image_path: Optional[str]):
+        super().__init__()
+        self.session = session
+        self.title = title
+        self.artist = artist
+        self.image_path = image_path
+        self.signals = TaskSignals()
+
+    def run(self) -> None:
+        try:
+            # 1. Update Metadata
+            self.session.set_metadata(self.title, self.artist)
+
+            # 2. Update Image (only if NEW image is provided)
+            # If image_path is None, we keep existing or do nothing
+            if self.image_path:
+                image_data, mime = audio_handler.read_image_file(
+                    self.image_path, audio_handler.COVER_MAX_DIM)
+                self.session.set_cover(image_data, mime)
+
+            # 3. Write everything back in a single save
+            self.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to save: {e}")
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(self.session)
+
 class MP3EditorApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("MP3 Cover Art Editor")
         self.setGeometry(100, 100, 800, 500)
+        QPixmapCache.setCacheLimit(65536) # KB, room for a few dozen decoded covers
 
         self.current_mp3_path: Optional[str] = None
         self.current_image_path: Optional[str] = None
         self.loaded_image_data: Optional[bytes] = None
+        self.session: Optional[audio_handler.Mp3Session] = None
+        # Background tasks in flight; references are kept until their signals fire
+        self._load_task: Optional[LoadMp3Task] = None
+        self._save_task: Optional[SaveMp3Task] = None
 
         self.init_ui()
 
@@ -188,19 +313,45 @@ class MP3EditorApp(QMainWindow):
         self.save_btn.setEnabled(can_save)
 
     def handle_mp3_drop(self, file_path: str) -> None:
+        # A new drop invalidates whatever was parsed for the previous file
+        self.session = None
+        self.current_mp3_path = None
+        self.mp3_panel.setText(f"Loading MP3:\n{os.path.basename(file_path)}")
+        self.update_save_params()
+
+        task = LoadMp3Task(file_path)
+        task.signals.finished.connect(lambda session: self.on_mp3_loaded(task, session))
+        task.signals.error.connect(lambda message: self.on_mp3_load_failed(task, message))
+        self._load_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def on_mp3_load_failed(self, task: LoadMp3Task, message: str) -> None:
+        if task is not self._load_task:
+            return # Superseded by a newer drop
+        self._load_task = None
+        self.mp3_panel.setText("Drop MP3 File Here")
+        QMessageBox.critical(self, "Error", f"Failed to read MP3: {message}")
+        self.update_save_params()
+
+    def on_mp3_loaded(self, task: LoadMp3Task, session: audio_handler.Mp3Session) -> None:
+        if task is not self._load_task:
+            return # Superseded by a newer drop
+        self._load_task = None
+
+        file_path = session.path
+        self.session = session
         self.current_mp3_path = file_path
         self.mp3_panel.setText(f"MP3 Loaded:\n{os.path.basename(file_path)}")
         
         # Load Metadata
-        meta = audio_handler.get_metadata(file_path)
+        meta = session.get_metadata()
         
         # Defaults
-        default_title = os.path.splitext(os.path.basename(file_path))[0]
-        default_artist = "סרקאסטים: אורן וצחי" # Default artist requested by user
+        default_title = Path(file_path).stem
 
         # Set Inputs
         self.title_input.setText(meta['title'] if meta['title'] else default_title)
-        self.artist_input.setText(meta['artist'] if meta['artist'] else default_artist)
+        self.artist_input.setText(meta['artist'] if meta['artist'] else _DEFAULT_ARTIST)
 
         self.checkForExistingCover()
         self.update_save_params()
@@ -210,27 +361,39 @@ class MP3EditorApp(QMainWindow):
         self.display_image(file_path)
         self.update_save_params()
 
+    def load_panel_pixmap(self, path: str) -> QPixmap:
+        """Returns the (cached) pixmap for an image file, sized for the image panel."""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return QPixmap()
+        target_size = self.image_panel.size() * self.image_panel.devicePixelRatio()
+        return _load_image_pixmap(path, mtime, target_size.width(), target_size.height())
+
     def display_image(self, path: str) -> None:
-        pixmap = QPixmap(path)
+        pixmap = self.load_panel_pixmap(path)
         if not pixmap.isNull():
             self.image_panel.setPixmap(pixmap) # Uses overridden method
         else:
             self.image_panel.setText(f"Failed to load image:\n{os.path.basename(path)}")
             
     def display_image_from_data(self, data: bytes) -> None:
-        pixmap = QPixmap()
-        if pixmap.loadFromData(data):
+        target_size = self.image_panel.size() * self.image_panel.devicePixelRatio()
+        pixmap = pixmap_from_data(data, target_size)
+        if not pixmap.isNull():
             self.image_panel.setPixmap(pixmap) # Uses overridden method
         else:
              self.image_panel.setText("Existing cover art found,\nbut failed to display.")
 
     def checkForExistingCover(self) -> None:
-        if not self.current_mp3_path:
+        if not self.session:
             return
         
         try:
-            art_data = audio_handler.extract_cover_art(self.current_mp3_path)
+            art_data = self.session.get_cover()
             if art_data:
+                # The session already holds the cover; repeat views of the same
+                # art come from the pixmap cache keyed by its content
                 self.display_image_from_data(art_data)
                 self.current_image_path = None # Reset pending new image since we are just viewing existing
             else:
@@ -244,34 +407,37 @@ class MP3EditorApp(QMainWindow):
 
     def update_save_params(self) -> None:
         # Enable save if MP3 is loaded (we can stick to editing tags even without new image)
-        can_save = (self.current_mp3_path is not None)
+        # and no load/save is still running in the background
+        busy = self._load_task is not None or self._save_task is not None
+        can_save = (self.current_mp3_path is not None) and not busy
         self.save_btn.setEnabled(can_save)
 
     def save_cover_art(self) -> None:
-        if not self.current_mp3_path:
+        if not self.current_mp3_path or not self.session or self._save_task:
             return
 
-        try:
-            # 1. Save Metadata
-            new_title = self.title_input.text()
-            new_artist = self.artist_input.text()
-            audio_handler.set_metadata(self.current_mp3_path, new_title, new_artist)
-
-            # 2. Save Image (only if NEW image is provided)
-            # If current_image_path is None, we keep existing or do nothing
-            if self.current_image_path:
-                audio_handler.embed_cover_art(self.current_mp3_path, self.current_image_path)
-            
-            QMessageBox.information(self, "Success", "Saved successfully!")
-            
-            # Refresh view
+        task = SaveMp3Task(self.session, self.title_input.text(), self.artist_input.text(),
+                           self.current_image_path)
+        task.signals.finished.connect(lambda session: self.on_save_finished(task, session))
+        task.signals.error.connect(lambda message: self.on_save_failed(task, message))
+        self._save_task = task
+        self.update_save_params()
+        QThreadPool.globalInstance().start(task)
+
+    def on_save_failed(self, task: SaveMp3Task, message: str) -> None:
+        self._save_task = None
+        QMessageBox.critical(self, "Error", f"Failed to save: {message}")
+        self.update_save_params()
+
+    def on_save_finished(self, task: SaveMp3Task, session: audio_handler.Mp3Session) -> None:
+        self._save_task = None
+        QMessageBox.information(self, "Success", "Saved successfully!")
+
+        # Refresh view, unless another MP3 was dropped while saving
+        if session is self.session and self.current_image_path == task.image_path:
             self.checkForExistingCover()
             self.current_image_path = None # Reset pending image
-            self.update_save_params()
-            
-        except Exception as e:
-            logger.error(f"Failed to save: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to save: {e}")
+        self.update_save_params()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
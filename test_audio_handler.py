@@ -0,0 +1,115 @@
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+from mutagen.id3 import ID3  # type: ignore
+
+import audio_handler
+
+# One MPEG-1 Layer III frame header (128 kbps, 44.1 kHz) padded to a full 417-byte frame
+MP3_FRAME = b'\xFF\xFB\x90\x00' + b'\x00' * 413
+
+
+@pytest.fixture
+def dummy_mp3(tmp_path):
+    p = tmp_path / "test.mp3"
+    p.write_bytes(MP3_FRAME * 20)
+    return str(p)
+
+
+@pytest.fixture
+def dummy_image(tmp_path):
+    p = tmp_path / "cover.jpg"
+    p.write_bytes(b'\xFF\xD8\xFF\xE0' + b'\x00' * 2048)
+    return str(p)
+
+
+def test_apply_changes_twice_keeps_single_tag(dummy_mp3, dummy_image):
+    audio_handler.apply_changes(dummy_mp3, "Title", "Artist", dummy_image)
+    size = os.path.getsize(dummy_mp3)
+    tag_size = ID3(dummy_mp3).size
+
+    audio_handler.apply_changes(dummy_mp3, "Title", "Artist", dummy_image)
+
+    assert os.path.getsize(dummy_mp3) == size
+    assert ID3(dummy_mp3).size == tag_size
+    assert audio_handler.get_metadata(dummy_mp3) == {'title': "Title", 'artist': "Artist"}
+
+
+@pytest.mark.parametrize("title, artist", [
+    ("English Title", "English Artist"),
+    ("שיר בעברית", "סרקאסטים: אורן וצחי"),
+])
+def test_set_metadata_round_trip(dummy_mp3, title, artist):
+    audio_handler.set_metadata(dummy_mp3, title, artist)
+    size = ID3(dummy_mp3).size
+    audio_handler.set_metadata(dummy_mp3, title, artist)
+
+    assert ID3(dummy_mp3).size == size
+    assert audio_handler.get_metadata(dummy_mp3) == {'title': title, 'artist': artist}
+
+
+@pytest.mark.parametrize("use_tinytag", [True, False])
+def test_read_functions_with_and_without_tinytag(dummy_mp3, dummy_image, monkeypatch, use_tinytag):
+    if use_tinytag:
+        pytest.importorskip("tinytag")
+        assert audio_handler.TinyTag is not None
+    else:
+        monkeypatch.setattr(audio_handler, "TinyTag", None)
+    audio_handler.apply_changes(dummy_mp3, "Title", "Artist", dummy_image)
+
+    assert audio_handler.get_metadata(dummy_mp3) == {'title': "Title", 'artist': "Artist"}
+    with open(dummy_image, 'rb') as f:
+        assert audio_handler.extract_cover_art(dummy_mp3) == f.read()
+
+
+def test_tinytag_cover_supports_both_apis():
+    # tinytag 2.x
+    image = SimpleNamespace(data=b'cover')
+    assert audio_handler._tinytag_cover(SimpleNamespace(images=SimpleNamespace(any=image))) == b'cover'
+    assert audio_handler._tinytag_cover(SimpleNamespace(images=SimpleNamespace(any=None))) is None
+    # tinytag 1.x
+    assert audio_handler._tinytag_cover(SimpleNamespace(get_image=lambda: b'cover')) == b'cover'
+    assert audio_handler._tinytag_cover(SimpleNamespace(get_image=lambda: None)) is None
+
+
+def test_longer_title_is_saved_in_place(dummy_mp3):
+    audio_handler.set_metadata(dummy_mp3, "T", "Artist")
+    size = os.path.getsize(dummy_mp3)
+
+    for title in ["Ti", "Tit", "Title", "Title 2"]:
+        audio_handler.set_metadata(dummy_mp3, title, "Artist")
+        assert os.path.getsize(dummy_mp3) == size
+
+    assert audio_handler.get_metadata(dummy_mp3)['title'] == "Title 2"
+
+
+def test_downscale_cover_flattens_transparency_onto_white():
+    Image = pytest.importorskip("PIL.Image")
+    im = Image.new('RGBA', (40, 20), (0, 0, 0, 0))
+    buf = io.BytesIO()
+    im.save(buf, format='PNG')
+
+    data, mime = audio_handler.downscale_cover(buf.getvalue(), 'image/png', max_dim=10)
+
+    assert mime == 'image/jpeg'
+    out = Image.open(io.BytesIO(data))
+    assert out.size == (10, 5)
+    assert out.convert('L').getextrema()[0] > 240
+
+
+def test_downscale_cover_applies_exif_orientation():
+    Image = pytest.importorskip("PIL.Image")
+    im = Image.new('RGB', (300, 200), 'red')
+    exif = Image.Exif()
+    exif[0x0112] = 6 # Orientation: rotate 90 degrees clockwise to display
+    buf = io.BytesIO()
+    im.save(buf, format='JPEG', exif=exif)
+
+    data, mime = audio_handler.downscale_cover(buf.getvalue(), 'image/jpeg', max_dim=100)
+
+    assert mime == 'image/jpeg'
+    out = Image.open(io.BytesIO(data))
+    assert out.size == (67, 100)
+    assert out.getexif().get(0x0112) in (None, 1)